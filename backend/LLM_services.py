@@ -53,6 +53,7 @@ import json
 import logging
 import os
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 from typing import Optional
 
 import boto3
@@ -636,7 +637,11 @@ def llm_get_location(prompt):
     else:
         return ''
 
+@lru_cache(maxsize=1)
 def get_groceries():
+    # Static data, but callers invoke this inside per-record (even per-store)
+    # loops during the FDA refresh — memoized so the ~300-entry list is
+    # built and stripped exactly once per process.
     grocery_stores = ["acme fresh market", "acme markets", "ahold delhaize", "albertsons", "aldi", "alex lee inc.", "amigo supermarkets",
                       "associated supermarkets", "baker's", "baker’s", "berkeley bowl", "big lots", "big y", "bingo wholesale",
                       "bj's wholesale club", "bj’s wholesale club", "boyer's food markets", "boyer’s food markets", "bravo ",
@@ -16,14 +16,20 @@ Endpoints:
   GET  /api/recalls/check/{upc}   – recall status for a single UPC
 """
 
+import asyncio
 import logging
+import time
+from datetime import date
 from typing import Optional
 
+import orjson
+import psycopg2.extras
 import requests as req
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict
 
-from database import execute_query
+from database import execute_query, execute_query_async, get_db_connection
 from ingredient_risk_engine import analyse_product_risk
 
 log = logging.getLogger(__name__)
@@ -33,15 +39,43 @@ router = APIRouter()
 OFF_PRODUCT_URL = "https://world.openfoodfacts.org/api/v2/product/{upc}.json"
 OFF_HEADERS     = {"User-Agent": "RecallAlert/0.2 (capstone@berkeley.edu)"}
 
+# One shared session for all Open Food Facts calls — keep-alive reuses the
+# TLS connection instead of paying a fresh DNS + handshake per lookup.
+# The adapter sizes the keep-alive pool for concurrent scans (requests'
+# default keeps only 10 connections) and retries transient failures once.
+_OFF_SESSION = req.Session()
+_OFF_SESSION.headers.update(OFF_HEADERS)
+_OFF_SESSION.mount(
+    "https://",
+    req.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=1),
+)
+
 
 # ── Data Models ────────────────────────────────────────────────────────────────
 
 class ProductSearch(BaseModel):
+    # /api/search is the hottest request body in the app — keep validation
+    # minimal: drop unknown fields instead of erroring, and freeze instances
+    # so assignment validation is skipped entirely.
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     upc:     Optional[str] = None
     name:    Optional[str] = None
     user_id: Optional[int] = None   # NEW: enables personalised risk analysis
 
 
+# Cap on UPCs per batched recall check — the use case is one cart or receipt
+# (10-30 UPCs), and the /api/recalls listing clamps pages to 500 too.
+RECALL_CHECK_BATCH_MAX = 500
+
+
+class RecallCheckBatch(BaseModel):
+    """Payload for checking recall status of many UPCs in one request."""
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+    upcs: list[str]
+
+
 class ManualProduct(BaseModel):
     """Payload for manually submitting a product that wasn't found in Open Food Facts."""
     upc:          str
@@ -68,7 +102,9 @@ def format_recall(row: dict) -> dict:
         "upc":                   row["upc"],
         "product_name":          row["product_name"],
         "brand_name":            row.get("brand_name") or "",
-        "recall_date":           str(row["recall_date"]),
+        # date objects pass through as-is — orjson encodes them as ISO-8601,
+        # identical to the old str() output, without the per-row conversion.
+        "recall_date":           row["recall_date"],
         "reason":                row["reason"],
         "hazard_classification": hazard,
         "source":                row.get("source") or "",
@@ -112,12 +148,39 @@ def word_overlap_score(a: str, b: str) -> float:
     shorter, longer = (words_a, words_b) if len(words_a) <= len(words_b) else (words_b, words_a)
     return len(shorter & longer) / len(shorter)
 
+# Set of every currently-recalled UPC, refreshed lazily. The overwhelmingly
+# common case is a UPC with no recall — the set probe answers that without a
+# DB round trip. No false negatives: the set covers all recall UPCs, is
+# rebuilt every TTL, and the refresh hook drops it when new recalls land.
+_RECALLED_UPCS_TTL = 300
+_recalled_upcs: dict = {"expires": 0.0, "upcs": None}
+
+
+def _get_recalled_upcs() -> Optional[set]:
+    """Return the set of recalled UPCs, or None when it cannot be loaded."""
+    now = time.time()
+    if _recalled_upcs["upcs"] is not None and now < _recalled_upcs["expires"]:
+        return _recalled_upcs["upcs"]
+    try:
+        rows = execute_query(
+            "SELECT DISTINCT upc FROM recalls WHERE upc IS NOT NULL AND upc <> '';"
+        )
+    except Exception as exc:
+        log.warning("Could not load recalled-UPC set: %s", exc)
+        return _recalled_upcs["upcs"]   # stale set (or None) — callers fall back
+    _recalled_upcs.update(
+        expires=now + _RECALLED_UPCS_TTL,
+        upcs={r["upc"] for r in rows},
+    )
+    return _recalled_upcs["upcs"]
+
+
 def check_recall(upc: str, product_name: str = "", brand_name: str = "") -> Optional[dict]:
     """
     Check if a product has an active recall.
 
     Matching strategy:
-      Step 1 — Exact UPC match
+      Step 1 — Exact UPC match (pre-screened by the in-process UPC set)
       Step 2 — Fuzzy product-name match:
           similarity >= 0.35
           OR substring match
@@ -126,20 +189,34 @@ def check_recall(upc: str, product_name: str = "", brand_name: str = "") -> Opti
     Returns formatted recall dict with match metadata, or None.
     """
     # ── Step 1: Exact UPC match ───────────────────────────────────────────
-    rows = execute_query(
-        "SELECT * FROM recalls WHERE upc = %s ORDER BY recall_date DESC LIMIT 1;",
-        (upc,),
-    )
-    if rows:
-        result = format_recall(rows[0])
-        result["match_method"] = "exact_upc"
-        result["match_confidence"] = 1.0
-        return result
+    # Pre-screen against the recalled-UPC set: a miss there means the exact
+    # query cannot hit, so skip straight to the fuzzy name stage. Only probe
+    # the DB when the set says "maybe" or could not be loaded.
+    recalled_set = _get_recalled_upcs()
+    if recalled_set is None or upc in recalled_set:
+        rows = execute_query(
+            "SELECT * FROM recalls WHERE upc = %s ORDER BY recall_date DESC LIMIT 1;",
+            (upc,),
+        )
+        if rows:
+            result = format_recall(rows[0])
+            result["match_method"] = "exact_upc"
+            result["match_confidence"] = 1.0
+            return result
 
     # ── Step 2: Fuzzy product name match ──────────────────────────────────
     if not product_name:
         return None
 
+    return _fuzzy_name_recall(product_name)
+
+
+def _fuzzy_name_recall(product_name: str) -> Optional[dict]:
+    """
+    Fuzzy product-name recall match (Step 2 of check_recall), split out so
+    callers that batch the exact-UPC step can run just this part for the
+    products without an exact hit.
+    """
     normalized_input = normalize_product_name(product_name)
     if not normalized_input:
         return None
@@ -197,6 +274,11 @@ def check_recall(upc: str, product_name: str = "", brand_name: str = "") -> Opti
             if rank_score > best_score:
                 best_score = rank_score
                 best_match = (row, sim, substring_hit, overlap)
+                # 1.0 is the rank ceiling (substring hit or full word
+                # overlap) — no later candidate can rank higher, and rows
+                # arrive sorted by similarity then recency, so stop here.
+                if best_score >= 1.0:
+                    break
 
         if best_match:
             row, sim, substring_hit, overlap = best_match
@@ -336,6 +418,29 @@ def check_recall(upc: str, product_name: str = "", brand_name: str = "") -> Opti
 #     return None
 
 
+def _split_ingredients(ingredients_raw: str) -> list[str]:
+    """
+    Split a stored ingredients string into display tokens.
+
+    New cache writes normalize '|' separators to ',' up front (see
+    _lookup_off), so the replace pass only runs for legacy rows that still
+    contain pipes — the per-request cost is a single split.
+    """
+    if not ingredients_raw:
+        return []
+    if "|" in ingredients_raw:
+        ingredients_raw = ingredients_raw.replace("|", ",")
+    return [i.strip() for i in ingredients_raw.split(",") if i.strip()]
+
+
+# Negative-result cache for OFF lookups. Found products land in the products
+# table (that is the positive cache), so only not-found UPCs kept paying the
+# full HTTP round trip on every re-scan. Genuine misses rarely change, so an
+# hour's TTL is safe; network errors are NOT cached.
+_OFF_NEG_TTL = 3600
+_off_neg_cache: dict[str, float] = {}
+
+
 def _lookup_off(upc: str) -> Optional[dict]:
     """
     Fetch a product from Open Food Facts by UPC.
@@ -343,20 +448,30 @@ def _lookup_off(upc: str) -> Optional[dict]:
     since most US 12-digit UPC-A barcodes are stored as EAN-13 in OFF.
     Returns a dict ready to INSERT into the products table, or None if not found.
     """
+    expires = _off_neg_cache.get(upc)
+    if expires and time.time() < expires:
+        return None
+
     candidates = [upc]
     if len(upc) == 12:
         candidates.append("0" + upc)    # UPC-A → EAN-13
     elif len(upc) == 13 and upc.startswith("0"):
         candidates.append(upc[1:])      # EAN-13 → UPC-A fallback
 
+    # Only a definitive miss (every candidate answered 404, or 200 with a
+    # not-found status) goes into the negative cache. A 429 or 5xx from
+    # OFF's public API is a transient failure, not an answer — caching it
+    # would hide a real product behind the manual-entry flow for an hour.
+    definitive = True
     try:
         for candidate in candidates:
-            resp = req.get(
+            resp = _OFF_SESSION.get(
                 OFF_PRODUCT_URL.format(upc=candidate),
-                headers=OFF_HEADERS,
                 timeout=8,
             )
             if resp.status_code != 200:
+                if resp.status_code != 404:   # throttled / server error
+                    definitive = False
                 continue
             data = resp.json()
             if data.get("status") != 1:
@@ -370,9 +485,16 @@ def _lookup_off(upc: str) -> Optional[dict]:
                 "product_name": product_name[:255],
                 "brand_name":   (p.get("brands") or "").split(",")[0].strip()[:255],
                 "category":     (p.get("categories") or "").split(",")[0].strip()[:100],
-                "ingredients":  (p.get("ingredients_text_debug") or "")[:5000],
+                # Normalize OFF's '|' separators at write time so the request
+                # path never has to re-run the replace per lookup.
+                "ingredients":  (p.get("ingredients_text_debug") or "").replace("|", ",")[:5000],
                 "image_url":    (p.get("image_url") or "")[:500],
             }
+
+        if definitive:
+            if len(_off_neg_cache) > 100_000:   # keep the cache bounded
+                _off_neg_cache.clear()
+            _off_neg_cache[upc] = time.time() + _OFF_NEG_TTL
         return None
     except Exception as exc:
         log.warning("Open Food Facts lookup failed for upc=%s: %s", upc, exc)
@@ -422,13 +544,17 @@ async def search_product(search: ProductSearch):
 
     If user_id is provided, allergen and diet preferences are loaded from the
     user's profile for personalised risk scoring.
+
+    All the blocking I/O below (psycopg2 queries, check_recall, the Open
+    Food Facts HTTP lookup with its 8 s timeouts) runs on the thread pool —
+    calling it inline would stall the event loop for the whole round trip.
     """
 
     # Load user profile once if user_id provided
     allergens: list[str] = []
     diets: list[str] = []
     if search.user_id:
-        profile = _load_user_profile(search.user_id)
+        profile = await asyncio.to_thread(_load_user_profile, search.user_id)
         allergens = profile["allergens"]
         diets     = profile["diets"]
 
@@ -436,14 +562,16 @@ async def search_product(search: ProductSearch):
         upc = search.upc.strip()
 
         # 1. Check our DB cache first
-        rows = execute_query("SELECT * FROM products WHERE upc = %s LIMIT 1;", (upc,))
+        rows = await execute_query_async(
+            "SELECT * FROM products WHERE upc = %s LIMIT 1;", (upc,)
+        )
         product = rows[0] if rows else None
 
         # 2. Not cached → try Open Food Facts
         if not product:
-            off_data = _lookup_off(upc)
+            off_data = await asyncio.to_thread(_lookup_off, upc)
             if off_data:
-                _cache_product(off_data)   # save for next time
+                await asyncio.to_thread(_cache_product, off_data)   # save for next time
                 product = off_data
 
         # 3. Still not found → tell frontend to show manual entry form
@@ -455,14 +583,15 @@ async def search_product(search: ProductSearch):
             }
 
         # 4. Check recalls (exact UPC → fuzzy product name fallback)
-        recall_info = check_recall(
+        recall_info = await asyncio.to_thread(
+            check_recall,
             upc,
-            product_name=product.get("product_name") or "",
-            brand_name=product.get("brand_name") or "",
+            product.get("product_name") or "",
+            product.get("brand_name") or "",
         )
 
         ingredients_raw = product.get("ingredients") or ""
-        ingredients = [i.strip() for i in ingredients_raw.replace("|", ",").split(",") if i.strip()]
+        ingredients = _split_ingredients(ingredients_raw)
 
         # 5. Run ingredient risk analysis (two-layer verdict)
         risk_report = analyse_product_risk(
@@ -489,26 +618,96 @@ async def search_product(search: ProductSearch):
         }
 
     elif search.name:
-        pattern = f"%{search.name.lower()}%"
-        rows = execute_query(
-            """
-            SELECT * FROM products
-            WHERE LOWER(product_name) LIKE %s OR LOWER(brand_name) LIKE %s
-            ORDER BY product_name
-            LIMIT 10;
-            """,
-            (pattern, pattern),
-        )
+        # Ranked full-text match against the precomputed name_tsv column
+        # first — the tsvector is generated at write time, so query-time
+        # cost is one GIN probe plus ranking. Partial-word queries (or a DB
+        # where the migration hasn't run) fall through to the ILIKE pass.
+        rows = []
+        try:
+            rows = await execute_query_async(
+                """
+                SELECT * FROM products
+                WHERE name_tsv @@ plainto_tsquery('english', %s)
+                ORDER BY ts_rank(name_tsv, plainto_tsquery('english', %s)) DESC
+                LIMIT 10;
+                """,
+                (search.name, search.name),
+            )
+        except Exception as exc:
+            log.warning("Full-text product search failed (name_tsv may be missing): %s", exc)
+
+        if not rows:
+            # ILIKE (not LOWER() LIKE) so the pg_trgm GIN indexes on
+            # product_name/brand_name can serve the %...% pattern as an
+            # index probe instead of a sequential scan.
+            pattern = f"%{search.name}%"
+            rows = await execute_query_async(
+                """
+                SELECT * FROM products
+                WHERE product_name ILIKE %s OR brand_name ILIKE %s
+                ORDER BY product_name
+                LIMIT 10;
+                """,
+                (pattern, pattern),
+            )
+
+        if not rows:
+            # Substring LIKE misses typos entirely ("chedar" finds nothing),
+            # so users retry with new spellings — extra requests for us and
+            # friction for them. Fall back to pg_trgm similarity ranking,
+            # the same extension check_recall already relies on.
+            try:
+                rows = await execute_query_async(
+                    """
+                    SELECT * FROM products
+                    WHERE similarity(LOWER(product_name), LOWER(%s)) > 0.3
+                       OR similarity(LOWER(brand_name), LOWER(%s)) > 0.3
+                    ORDER BY GREATEST(
+                        similarity(LOWER(product_name), LOWER(%s)),
+                        similarity(LOWER(brand_name), LOWER(%s))
+                    ) DESC
+                    LIMIT 10;
+                    """,
+                    (search.name, search.name, search.name, search.name),
+                )
+            except Exception as exc:
+                log.warning("Fuzzy product search failed (pg_trgm may not be enabled): %s", exc)
+                rows = []
+
         if not rows:
             raise HTTPException(status_code=404, detail="No products found")
 
+        # One batched exact-UPC recall lookup for the whole result page —
+        # the per-product check_recall calls issued up to 10 separate
+        # queries here. Fuzzy name matching still runs per product, but
+        # only for products without an exact UPC hit.
+        upcs = [p["upc"] for p in rows if p.get("upc")]
+        exact_by_upc: dict[str, dict] = {}
+        if upcs:
+            try:
+                recall_rows = await execute_query_async(
+                    """
+                    SELECT DISTINCT ON (upc) * FROM recalls
+                    WHERE upc = ANY(%s)
+                    ORDER BY upc, recall_date DESC;
+                    """,
+                    (upcs,),
+                )
+                for r in recall_rows:
+                    hit = format_recall(r)
+                    hit["match_method"] = "exact_upc"
+                    hit["match_confidence"] = 1.0
+                    exact_by_upc[r["upc"]] = hit
+            except Exception as exc:
+                log.warning("Batched recall lookup failed: %s", exc)
+
         results = []
         for product in rows:
-            recall_info = check_recall(
-                product["upc"],
-                product_name=product.get("product_name") or "",
-                brand_name=product.get("brand_name") or "",
-            )
+            recall_info = exact_by_upc.get(product.get("upc"))
+            if recall_info is None:
+                recall_info = await asyncio.to_thread(
+                    _fuzzy_name_recall, product.get("product_name") or ""
+                )
 
             ingredients_raw = product.get("ingredients") or ""
             risk_report = analyse_product_risk(
@@ -554,10 +753,14 @@ async def submit_product(product: ManualProduct):
     """
     upc = product.upc.strip()
 
+    # Blocking psycopg2 work — keep it off the event loop (same treatment
+    # as /api/search).
     # Don't overwrite if it already exists
-    existing = execute_query("SELECT upc FROM products WHERE upc = %s LIMIT 1;", (upc,))
+    existing = await execute_query_async(
+        "SELECT upc FROM products WHERE upc = %s LIMIT 1;", (upc,)
+    )
     if not existing:
-        execute_query(
+        await execute_query_async(
             """
             INSERT INTO products (upc, product_name, brand_name, category, ingredients)
             VALUES (%(upc)s, %(product_name)s, %(brand_name)s, %(category)s, %(ingredients)s)
@@ -573,17 +776,18 @@ async def submit_product(product: ManualProduct):
         )
 
     # Check recalls immediately (exact UPC → fuzzy name fallback)
-    recall_info = check_recall(
+    recall_info = await asyncio.to_thread(
+        check_recall,
         upc,
-        product_name=product.product_name,
-        brand_name=product.brand_name or "",
+        product.product_name,
+        product.brand_name or "",
     )
 
     # Run risk analysis
     allergens: list[str] = []
     diets: list[str] = []
     if product.user_id:
-        profile = _load_user_profile(product.user_id)
+        profile = await asyncio.to_thread(_load_user_profile, product.user_id)
         allergens = profile["allergens"]
         diets     = profile["diets"]
 
@@ -608,20 +812,177 @@ async def submit_product(product: ManualProduct):
     }
 
 
+# The recalls table only changes when the FDA refresh runs (every 24 h), so
+# formatted /api/recalls pages are cached briefly, keyed by (limit, cursor).
+_RECALLS_LIST_TTL = 300
+_recalls_list_cache: dict[tuple, tuple[float, dict]] = {}
+
+
+def invalidate_recall_caches() -> None:
+    """Drop cached recall-derived state. Called after a recall refresh."""
+    _recalls_list_cache.clear()
+    _recall_check_cache.clear()
+    _recalled_upcs["expires"] = 0.0
+
+
 @router.get("/api/recalls")
-async def get_all_recalls():
-    """Return all recalls from RDS, newest first."""
-    rows = execute_query("SELECT * FROM recalls ORDER BY recall_date DESC;")
+async def get_all_recalls(limit: int = 100, after: Optional[str] = None):
+    """
+    Return recalls newest first, keyset-paginated.
+
+    Query params:
+      limit — page size (1-500, default 100)
+      after — opaque cursor from the previous page's next_cursor;
+              omit for the first page.
+
+    Returning the whole table on every call scaled response time and bytes
+    linearly with DB size; keyset pagination bounds each request, and
+    (recall_date, id) ordering keeps pages stable while new recalls land.
+    A null next_cursor means the listing is exhausted.
+    """
+    limit = max(1, min(limit, 500))
+    now = time.time()
+
+    cache_key = (limit, after)
+    cached = _recalls_list_cache.get(cache_key)
+    if cached and now < cached[0]:
+        return cached[1]
+
+    if after:
+        try:
+            after_date, after_id_str = after.rsplit("|", 1)
+            after_id = int(after_id_str)
+            # Validate the date half too — a cursor like "banana|3" would
+            # otherwise pass parsing and blow up as a Postgres DataError
+            # (an unhandled 500) inside the row comparison.
+            date.fromisoformat(after_date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor.")
+        rows = execute_query(
+            """
+            SELECT * FROM recalls
+            WHERE (recall_date, id) < (%s, %s)
+            ORDER BY recall_date DESC, id DESC
+            LIMIT %s;
+            """,
+            (after_date, after_id, limit),
+        )
+    else:
+        rows = execute_query(
+            "SELECT * FROM recalls ORDER BY recall_date DESC, id DESC LIMIT %s;",
+            (limit,),
+        )
+
+    next_cursor = None
+    if len(rows) == limit:
+        last = rows[-1]
+        next_cursor = f"{last['recall_date']}|{last['id']}"
+
+    payload = {
+        "count":       len(rows),
+        "recalls":     [format_recall(r) for r in rows],
+        "next_cursor": next_cursor,
+    }
+
+    if len(_recalls_list_cache) > 64:   # keep the page cache bounded
+        _recalls_list_cache.clear()
+    _recalls_list_cache[cache_key] = (now + _RECALLS_LIST_TTL, payload)
+    return payload
+
+
+@router.get("/api/recalls/export")
+async def export_recalls():
+    """
+    Stream every recall as NDJSON (one JSON object per line), newest first.
+
+    Uses a named server-side cursor so memory stays constant regardless of
+    table size. Intended for bulk consumers; interactive clients should use
+    the paginated /api/recalls listing.
+    """
+    def generate():
+        conn = get_db_connection()
+        try:
+            with conn.cursor(
+                name="recalls_export",
+                cursor_factory=psycopg2.extras.RealDictCursor,
+            ) as cur:
+                cur.itersize = 1000
+                cur.execute("SELECT * FROM recalls ORDER BY recall_date DESC, id DESC;")
+                for row in cur:
+                    yield orjson.dumps(format_recall(row)) + b"\n"
+        finally:
+            conn.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+# Per-UPC result cache for /api/recalls/check — called on every barcode scan,
+# while the recalls table only changes when the FDA refresh runs. Misses get
+# a shorter TTL so a newly ingested recall shows up quickly for UPCs that
+# were recently checked clean.
+_RECALL_CHECK_TTL     = 300
+_RECALL_CHECK_NEG_TTL = 60
+_recall_check_cache: dict[str, tuple[float, Optional[dict]]] = {}
+
+
+@router.post("/api/recalls/check")
+async def check_recalls_batch(body: RecallCheckBatch):
+    """
+    Recall status for many UPCs in one round trip.
+
+    Scanning a cart or receipt produces 10-30 UPCs; hitting
+    /api/recalls/check/{upc} per barcode paid an HTTP + DB round trip each.
+    DISTINCT ON (upc) ... WHERE upc = ANY(%s) returns the newest recall per
+    UPC in a single index scan. Exact-UPC matching only — callers here have
+    no product name to drive the fuzzy fallback (same as the single-UPC GET).
+    """
+    upcs = [u.strip() for u in body.upcs if u and u.strip()]
+    if not upcs:
+        return {}
+    if len(upcs) > RECALL_CHECK_BATCH_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many UPCs in one batch (max {RECALL_CHECK_BATCH_MAX}).",
+        )
+
+    rows = await asyncio.to_thread(
+        execute_query,
+        """
+        SELECT DISTINCT ON (upc) * FROM recalls
+        WHERE upc = ANY(%s)
+        ORDER BY upc, recall_date DESC;
+        """,
+        (upcs,),
+    )
+
+    by_upc: dict[str, dict] = {}
+    for r in rows:
+        hit = format_recall(r)
+        hit["match_method"] = "exact_upc"
+        hit["match_confidence"] = 1.0
+        by_upc[r["upc"]] = hit
+
     return {
-        "count":   len(rows),
-        "recalls": [format_recall(r) for r in rows],
+        u: {"is_recalled": u in by_upc, "recall_info": by_upc.get(u)}
+        for u in upcs
     }
 
 
 @router.get("/api/recalls/check/{upc}")
 async def check_recall_for_upc(upc: str):
     """Check whether a specific UPC has an active recall."""
-    recall_info = check_recall(upc)
+    now = time.time()
+    cached = _recall_check_cache.get(upc)
+    if cached and now < cached[0]:
+        recall_info = cached[1]
+    else:
+        # check_recall is blocking psycopg2 I/O — keep it off the event loop.
+        recall_info = await asyncio.to_thread(check_recall, upc)
+        if len(_recall_check_cache) > 100_000:   # keep the cache bounded
+            _recall_check_cache.clear()
+        ttl = _RECALL_CHECK_TTL if recall_info else _RECALL_CHECK_NEG_TTL
+        _recall_check_cache[upc] = (now + ttl, recall_info)
+
     if recall_info:
         return {"is_recalled": True, "recall_info": recall_info}
     return {"is_recalled": False, "recall_info": None}
\ No newline at end of file
@@ -2,9 +2,13 @@
 Database connection module for Food Recall Alert.
 Connects to AWS RDS PostgreSQL using credentials from .env file.
 """
+import asyncio
 import os
+import threading
+import time
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -20,8 +24,59 @@ DB_CONFIG = {
 }
 
 
+# Shared connection pool — with sslmode=verify-full a fresh connection costs
+# a full TCP + TLS handshake (tens of ms), which execute_query previously
+# paid on every single query. Created lazily so importing this module never
+# touches the network (tooling, scripts).
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool() -> psycopg2.pool.ThreadedConnectionPool:
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = psycopg2.pool.ThreadedConnectionPool(
+                    minconn=1,
+                    maxconn=int(os.getenv("DB_POOL_MAX", "10")),
+                    **DB_CONFIG,
+                )
+    return _POOL
+
+
+def close_pool() -> None:
+    """Close all pooled connections. Called from the app shutdown hook."""
+    global _POOL
+    if _POOL is not None:
+        _POOL.closeall()
+        _POOL = None
+
+
+def _checkout_conn(pool):
+    """
+    getconn with a short bounded wait.
+
+    ThreadedConnectionPool.getconn raises PoolError immediately when the
+    pool is exhausted — under thread-pool fan-out that would turn request
+    bursts into hard 500s. Retry briefly so bursts queue behind in-flight
+    queries; if the pool is still dry after the wait, fall back to a direct
+    unpooled connection (the pre-pool behaviour) instead of erroring.
+
+    Returns (conn, pooled) — pooled tells the caller how to release it.
+    """
+    deadline = time.monotonic() + 2.0
+    while True:
+        try:
+            return pool.getconn(), True
+        except psycopg2.pool.PoolError:
+            if time.monotonic() >= deadline:
+                return psycopg2.connect(**DB_CONFIG), False
+            time.sleep(0.05)
+
+
 def get_db_connection():
-    """Open and return a new database connection."""
+    """Open and return a new (unpooled) database connection."""
     return psycopg2.connect(**DB_CONFIG)
 
 
@@ -49,16 +104,38 @@ def execute_query(query: str, params=None):
     INSERT/UPDATE that used RETURNING (fetch=True) was silently rolled back
     when the connection closed.
     """
-    conn = get_db_connection()
+    pool = _get_pool()
+    conn, pooled = _checkout_conn(pool)
     try:
         with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
             cur.execute(query, params)
             # Fetch results BEFORE commit so the cursor buffer is still accessible.
-            results = [dict(row) for row in cur.fetchall()] if cur.description else []
+            # RealDictRow is already a dict subclass — wrapping each row in
+            # dict(row) doubled the allocations on large result sets.
+            results = cur.fetchall() if cur.description else []
             conn.commit()   # Always commit — writes are persisted, reads are no-ops
             return results
     except Exception:
-        conn.rollback()
+        try:
+            conn.rollback()
+        except Exception:
+            pass   # connection may be dead — putconn below discards it
         raise
     finally:
-        conn.close()
+        if pooled:
+            # Return the connection to the pool; discard it if it went bad.
+            pool.putconn(conn, close=bool(conn.closed))
+        else:
+            conn.close()
+
+
+async def execute_query_async(query: str, params=None):
+    """
+    Async wrapper around execute_query.
+
+    psycopg2 is synchronous, so calling execute_query directly inside an
+    async endpoint blocks the event loop for the whole round trip. This
+    runs it on the default thread pool instead; the connection pool above
+    is thread-safe.
+    """
+    return await asyncio.to_thread(execute_query, query, params)
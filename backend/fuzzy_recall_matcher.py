@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import cached_property
 from typing import List, Optional, Protocol
 import re
 
@@ -102,11 +103,14 @@ class RecallCandidate:
 
     source: str
 
-    @property
+    # cached_property: candidates are reused across many queries (and now
+    # cached across scans), so the normalization regex chain runs once per
+    # candidate instead of once per access.
+    @cached_property
     def display_text(self) -> str:
         return f"{self.brand_name} {self.product_name}".strip()
 
-    @property
+    @cached_property
     def norm_text(self) -> str:
         return normalize_text(self.display_text)
 
@@ -127,24 +131,41 @@ class BasicTokenSetRecallMatcher:
     """
     Simple baseline matcher:
     - normalize receipt text
-    - compare against every recall candidate
-    - use token_set_ratio
+    - use token_set_ratio against recall candidates
     - return the best candidate if above threshold
+
+    An inverted token -> candidate-index map built once in __init__ narrows
+    scoring to candidates sharing at least one exact token with the query,
+    instead of scanning the full candidate list on every call. Queries that
+    share no token with any candidate (e.g. OCR typos) fall back to the
+    full scan so results are unchanged.
     """
 
     def __init__(self, candidates: List[RecallCandidate]):
         self.candidates = candidates
+        self.candidate_texts = [c.norm_text for c in candidates]
+
+        self.token_index: dict[str, list[int]] = {}
+        for idx, text in enumerate(self.candidate_texts):
+            for token in set(text.split()):
+                self.token_index.setdefault(token, []).append(idx)
 
     def best_match(self, query: str, threshold: float = 0.78) -> Optional[RecallMatch]:
         q = normalize_text(query)
         if not q:
             return None
 
-        best_candidate = None
+        idxs: set[int] = set()
+        for token in set(q.split()):
+            idxs.update(self.token_index.get(token, ()))
+
+        candidate_idxs = idxs if idxs else range(len(self.candidates))
+
+        best_idx = None
         best_score = 0.0
 
-        for c in self.candidates:
-            cand_text = c.norm_text
+        for i in candidate_idxs:
+            cand_text = self.candidate_texts[i]
             if not cand_text:
                 continue
 
@@ -152,13 +173,13 @@ class BasicTokenSetRecallMatcher:
 
             if score > best_score:
                 best_score = score
-                best_candidate = c
+                best_idx = i
 
-        if best_candidate is None or best_score < threshold:
+        if best_idx is None or best_score < threshold:
             return None
 
         return RecallMatch(
-            candidate=best_candidate,
+            candidate=self.candidates[best_idx],
             score=best_score,
             algorithm="basic_token_set",
         )
@@ -9,6 +9,30 @@ migrations = [
     "ALTER TABLE alerts RENAME COLUMN sent_at TO created_at;",
     "ALTER TABLE users ADD COLUMN IF NOT EXISTS password_hash VARCHAR(255);",
     "ALTER TABLE alerts ADD COLUMN IF NOT EXISTS dismissed BOOLEAN DEFAULT FALSE;",
+    # Indexes for the alert-generation joins and the recall-by-UPC lookups.
+    # (upc, recall_date DESC) turns the WHERE upc = %s ORDER BY recall_date
+    # DESC LIMIT 1 pattern in check_recall into a single index seek, no sort.
+    "CREATE INDEX IF NOT EXISTS recalls_upc_date_idx ON recalls (upc, recall_date DESC);",
+    "CREATE INDEX IF NOT EXISTS alerts_user_recall_idx ON alerts (user_id, recall_id);",
+    "CREATE INDEX IF NOT EXISTS user_carts_upc_idx ON user_carts (product_upc);",
+    # Backs the keyset-paginated /api/recalls listing and the NDJSON export
+    # (ORDER BY recall_date DESC, id DESC) with an index-ordered scan.
+    "CREATE INDEX IF NOT EXISTS recalls_date_id_desc_idx ON recalls (recall_date DESC, id DESC);",
+    # Trigram GIN indexes let the '%foo%' name search (now ILIKE) and the
+    # similarity() fallbacks use index probes instead of seq scans.
+    # LOWER(...) LIKE could never use an index at all.
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+    "CREATE INDEX IF NOT EXISTS products_name_trgm ON products USING gin (product_name gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS products_brand_trgm ON products USING gin (brand_name gin_trgm_ops);",
+    "CREATE INDEX IF NOT EXISTS recalls_name_trgm ON recalls USING gin (product_name gin_trgm_ops);",
+    "CREATE UNIQUE INDEX IF NOT EXISTS products_upc_uidx ON products (upc);",
+    # Generated tsvector over product + brand name: the normalization work
+    # happens once at row write time, so name search is a GIN probe + rank
+    # at query time instead of per-request string munging.
+    "ALTER TABLE products ADD COLUMN IF NOT EXISTS name_tsv tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', "
+    "coalesce(product_name,'') || ' ' || coalesce(brand_name,''))) STORED;",
+    "CREATE INDEX IF NOT EXISTS products_tsv_idx ON products USING gin (name_tsv);",
 ]
 
 for sql in migrations:
@@ -27,9 +27,12 @@ Database requirement:
 
 from __future__ import annotations
 
+import fcntl
 import logging
+import os
 import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 from typing import Optional
 
 import requests as req
@@ -59,35 +62,50 @@ FDA_ENFORCEMENT_URL = "https://api.fda.gov/food/enforcement.json"
 REQUEST_TIMEOUT     = 15   # seconds
 RECALL_PAGE_LIMIT   = 100  # records per FDA API page (max 1000)
 
+# Shared keep-alive session for api.fda.gov — the initiation and termination
+# fetchers each paid a fresh TLS handshake per bare requests.get call.
+_FDA_SESSION = req.Session()
+_FDA_SESSION.headers.update({"User-Agent": "FoodRecallAlert/0.2"})
+
 # ── Field mappers ────────────────────────────────────────────────────────────────────────────────────────────────────────────────
 
+#digit run of 12-13, tolerating single spaces/dashes between digits
+#(FDA texts format UPCs like "8 06795 61441 1" or "7-67778-00001-3")
+_RE_UPC = re.compile(r"\d(?:[\s-]?\d){10,12}")
+
+
+def _is_valid_gtin(digits: str) -> bool:
+    """GTIN-12/13 check-digit validation (mod-10 with 3/1 weights from the right)."""
+    if len(digits) not in (12, 13):
+        return False
+    nums = [int(c) for c in digits]
+    total = sum(d * (3 if i % 2 == 0 else 1) for i, d in enumerate(reversed(nums[:-1])))
+    return (10 - total % 10) % 10 == nums[-1]
+
+
 #extract UPC formulaically
 def get_upc(text):
-    #get upc indices
-    start = 0
-    indices = []
-    while True:
-        start = text.lower().find('upc', start)
-        if start == -1:
-            break
-        indices.append(start)
-        start += len('upc')
+    """
+    Extract GTIN-12/13 codes that follow a 'UPC' marker in FDA free text.
 
+    Previous version collected the first 12 digits after each marker with a
+    char-by-char loop — lot numbers and date codes that happen to contain
+    12 digits slipped through and polluted the recalls table with bogus
+    ON CONFLICT keys. Candidates now come from a single compiled regex and
+    are kept only when the GTIN check digit validates.
+    """
+    lower = text.lower()
     upc_list = []
-    for i in indices:
-        n = 0
-        c = 0
-        upc = ""
-
-        #get the upcs
-        while (n < 12) & ((i + c) < len(text)):
-            char = text[i+c]
-            c = c + 1
-            if char.isdigit():
-                n = n + 1
-                upc = upc + char
-        if len(upc) == 12:
-          upc_list.append(upc)
+    start = lower.find('upc')
+    while start != -1:
+        #scan a short window after the marker so digit runs elsewhere in the
+        #description (lot numbers, case counts) are never considered
+        window = text[start:start + 60]
+        for m in _RE_UPC.finditer(window):
+            digits = re.sub(r"\D", "", m.group())
+            if _is_valid_gtin(digits) and digits not in upc_list:
+                upc_list.append(digits)
+        start = lower.find('upc', start + len('upc'))
     return upc_list
 
 
@@ -278,12 +296,41 @@ def product_listformat(product, codeinformation):
 #         log.error("FDA API fetch error (skip=%d): %s", skip, exc)
 #         return []
 
+# Column-width truncations applied when mapping FDA records to the recalls
+# schema. Precomputed once so the per-record builder is a single tight pass
+# instead of scattering slice bounds across four near-identical dict literals.
+_RECALL_FIELD_WIDTHS = (
+    ("product_name", 255),
+    ("brand_name", 255),
+    ("distribution_pattern", 500),
+)
+
+
+def _build_recall_record(upc, product_firm, fda_result, recall_date, distribution_pattern):
+    """Map one cleaned FDA enforcement record to the recalls table schema."""
+    record = {
+        "upc":                  upc,
+        "product_name":         product_firm,
+        "brand_name":           fda_result['recalling_firm'].lower(),
+        "recall_date":          recall_date,
+        "reason":               fda_result['reason_for_recall'],
+        "severity":             fda_result['classification'],
+        "distribution_pattern": distribution_pattern,
+        "source":               "fda",
+    }
+    for field, width in _RECALL_FIELD_WIDTHS:
+        value = record[field]
+        if isinstance(value, str) and len(value) > width:
+            record[field] = value[:width]
+    return record
+
+
 def fetch_new_recall_initiation():
     from datetime import date, timedelta
     dt1 = (date.today() - timedelta(days = 31)).strftime("%Y%m%d")
     dt2 = (date.today()).strftime("%Y%m%d")
     fda_initiated_url = f"https://api.fda.gov/food/enforcement.json?search=recall_initiation_date:[{dt1}+TO+{dt2}]+AND+status:'Ongoing'&limit=1000"
-    fda_initiated = req.get(fda_initiated_url).json()
+    fda_initiated = _FDA_SESSION.get(fda_initiated_url, timeout=REQUEST_TIMEOUT).json()
 
     initiated_items = []
     
@@ -319,30 +366,20 @@ def fetch_new_recall_initiation():
                         if key in seen:
                             continue
                         seen.add(key)
-                        item_dict = {"upc":u,
-                             "product_name":product_firm[:255],
-                             "brand_name":fda_initiated['results'][i]['recalling_firm'].lower(),
-                             "recall_date":date,
-                             "reason":fda_initiated['results'][i]['reason_for_recall'],
-                             "severity":fda_initiated['results'][i]['classification'],
-                             "distribution_pattern":distribution_pattern_str_clean,
-                             "source":"fda"}
-                        initiated_items.append(item_dict)
+                        initiated_items.append(_build_recall_record(
+                            u, product_firm, fda_initiated['results'][i],
+                            date, distribution_pattern_str_clean,
+                        ))
                 else:
                     key = ('', product_firm)
                     if key in seen:
                         continue
                     seen.add(key)
-                    item_dict = {"upc":'',
-                            "product_name":product_firm[:255],
-                            "brand_name":fda_initiated['results'][i]['recalling_firm'].lower(),
-                            "recall_date":date,
-                            "reason":fda_initiated['results'][i]['reason_for_recall'],
-                            "severity":fda_initiated['results'][i]['classification'],
-                            "distribution_pattern":distribution_pattern_str_clean,
-                            "source":"fda"}
-                    initiated_items.append(item_dict)
-                    
+                    initiated_items.append(_build_recall_record(
+                        '', product_firm, fda_initiated['results'][i],
+                        date, distribution_pattern_str_clean,
+                    ))
+
     return initiated_items
 
 def fetch_new_recall_termination():
@@ -350,7 +387,7 @@ def fetch_new_recall_termination():
     dt1 = (date.today() - timedelta(days = 1)).strftime("%Y%m%d")
     dt2 = (date.today()).strftime("%Y%m%d")
     fda_terminated_url = f"https://api.fda.gov/food/enforcement.json?search=termination_date:[{dt1}+TO+{dt2}]+AND+status:'Terminated'&limit=1000"
-    fda_terminated = req.get(fda_terminated_url).json()
+    fda_terminated = _FDA_SESSION.get(fda_terminated_url, timeout=REQUEST_TIMEOUT).json()
 
     terminated_items = []
     
@@ -359,51 +396,41 @@ def fetch_new_recall_termination():
         terminated_items.append('')
     else:
         for i in np.arange(0, len(fda_terminated['results'])):
-            date = datetime.strptime(fda_initiated['results'][i]['termination_date'], '%Y%m%d').date()
-            distribution_pattern = fda_initiated['results'][i]['distribution_pattern']
+            date = datetime.strptime(fda_terminated['results'][i]['termination_date'], '%Y%m%d').date()
+            distribution_pattern = fda_terminated['results'][i]['distribution_pattern']
             distribution_pattern_str = _llm_get_location(distribution_pattern).replace("'","").strip()
-            product_cleaned = product_listformat(fda_initiated['results'][i]['product_description'], fda_initiated['results'][i]['code_info'])
+            product_cleaned = product_listformat(fda_terminated['results'][i]['product_description'], fda_terminated['results'][i]['code_info'])
 
             for p in product_cleaned:
-                product_firm = p[0] + fda_initiated['results'][i]['recalling_firm'].lower()
+                product_firm = p[0] + fda_terminated['results'][i]['recalling_firm'].lower()
 
                 grocery_stores = _grocery_stores()
                 for g in grocery_stores:
-                    if g in fda_initiated['results'][i]['recalling_firm'].lower():
+                    if g in fda_terminated['results'][i]['recalling_firm'].lower():
                         product_firm = p[0]
 
                 seen = set()
-                
+
                 if len(p[1]) > 0:
                     for u in p[1]:
                         key = (u, product_firm)
                         if key in seen:
                             continue
                         seen.add(key)
-                        item_dict = {"upc":u,
-                             "product_name":product_firm[:255],
-                             "brand_name":fda_initiated['results'][i]['recalling_firm'].lower(),
-                             "recall_date":date,
-                             "reason":fda_initiated['results'][i]['reason_for_recall'],
-                             "severity":fda_initiated['results'][i]['classification'],
-                             "distribution_pattern":distribution_pattern_str,
-                             "source":"fda"}
-                        terminated_items.append(item_dict)
+                        terminated_items.append(_build_recall_record(
+                            u, product_firm, fda_terminated['results'][i],
+                            date, distribution_pattern_str,
+                        ))
                 else:
                     key = ('', product_firm)
                     if key in seen:
                         continue
                     seen.add(key)
-                    item_dict = {"upc":'',
-                            "product_name":product_firm[:255],
-                            "brand_name":fda_initiated['results'][i]['recalling_firm'].lower(),
-                            "recall_date":date,
-                            "reason":fda_initiated['results'][i]['reason_for_recall'],
-                            "severity":fda_initiated['results'][i]['classification'],
-                            "distribution_pattern":distribution_pattern_str,
-                            "source":"fda"}
-                    terminated_items.append(item_dict)
-    
+                    terminated_items.append(_build_recall_record(
+                        '', product_firm, fda_terminated['results'][i],
+                        date, distribution_pattern_str,
+                    ))
+
     return terminated_items
 
 # ── Field mappers ─────────────────────────────────────────────────────────────────────────────────────
@@ -613,6 +640,20 @@ def _generate_recall_summary(recall_record: dict) -> None:
 
 # ── Main refresh pipeline ─────────────────────────────────────────────────────
 
+def _ingest_recall_item(fda_item: dict) -> bool:
+    """
+    Upsert one FDA record and generate its plain-language summary when it
+    was freshly inserted. Returns True on a new insert, False otherwise.
+
+    Safe to run from worker threads: each execute_query opens its own
+    connection, and Bedrock calls are independent per record.
+    """
+    was_inserted = add_item_recall(fda_item)
+    if was_inserted:
+        _generate_recall_summary(fda_item)
+    return was_inserted
+
+
 def run_recall_refresh() -> dict:
     """
     Full recall refresh pipeline:
@@ -636,14 +677,18 @@ def run_recall_refresh() -> dict:
     # ── FDA ───────────────────────────────────────────────────────────────────
     initiated_items = fetch_new_recall_initiation()
     log.info("FDA: fetched %d raw records.", len(initiated_items))
-    for fda_item in initiated_items:
-        if fda_item != '':
-            was_inserted = add_item_recall(fda_item)
-            if was_inserted:
-                inserted += 1
-                _generate_recall_summary(fda_item)
-            else:
-                skipped += 1
+    records = [i for i in initiated_items if i != '']
+
+    # Upsert + summary generation are both I/O-bound (psycopg2 round trip,
+    # Bedrock call) — overlap them across a small thread pool instead of
+    # processing one record at a time.
+    if records:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for was_inserted in pool.map(_ingest_recall_item, records):
+                if was_inserted:
+                    inserted += 1
+                else:
+                    skipped += 1
 
     terminated_items = fetch_new_recall_termination()
     for fda_item in terminated_items:
@@ -674,6 +719,18 @@ def run_recall_refresh() -> dict:
     #     else:
     #         skipped += 1
 
+    # ── Cache invalidation ────────────────────────────────────────────────────
+    # New/removed recalls should show up immediately instead of waiting out
+    # the in-process cache TTLs. Per-worker: each process that runs the
+    # refresh invalidates its own snapshot; the others expire via TTL.
+    try:
+        from barcode_routes import invalidate_recall_caches
+        from receipt_scan import invalidate_matcher_cache
+        invalidate_recall_caches()
+        invalidate_matcher_cache()
+    except Exception as exc:
+        log.debug("Recall cache invalidation skipped: %s", exc)
+
     # ── Alerts ────────────────────────────────────────────────────────────────
     alerts_generated = generate_alerts_for_new_recalls()
 
@@ -693,18 +750,36 @@ def run_recall_refresh() -> dict:
 
 _scheduler: Optional[BackgroundScheduler] = None
 
+# Held open for the process lifetime by whichever worker wins the lock below.
+_scheduler_lock_file = None
+
 
 def start_recall_scheduler():
     """
     Start a background thread that calls run_recall_refresh() every 6 hours.
     Safe to call multiple times – will not start a second scheduler.
     Called from app.py's @app.on_event("startup").
+
+    Under multi-worker uvicorn every worker runs the startup hook; without a
+    guard each process would fire its own refresh pipeline (FDA fetches and
+    per-record Bedrock calls multiplied by the worker count). A host-level
+    advisory file lock lets exactly one worker own the scheduler; the lock
+    is released automatically if that process dies.
     """
-    global _scheduler
+    global _scheduler, _scheduler_lock_file
     if _scheduler and _scheduler.running:
         log.info("Recall scheduler already running – skipping start.")
         return
 
+    lock_path = os.getenv("RECALL_SCHEDULER_LOCK", "/tmp/recall_scheduler.lock")
+    try:
+        lock_file = open(lock_path, "w")
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        log.info("Recall scheduler owned by another worker – skipping start.")
+        return
+    _scheduler_lock_file = lock_file
+
     _scheduler = BackgroundScheduler(daemon=True)
     _scheduler.add_job(
         run_recall_refresh,
@@ -718,12 +793,18 @@ def start_recall_scheduler():
     _scheduler.start()
     log.info("Recall scheduler started – refresh every 24 hours.")
 
-    # Run once immediately on startup so the DB is fresh right away
-    # (comment out if you don't want an immediate run on every deploy)
-    try:
-        run_recall_refresh()
-    except Exception as exc:
-        log.error("Initial recall refresh failed: %s", exc)
+    # Schedule the first refresh a few seconds out instead of running it
+    # inline — a refresh can take 10-60 s of HTTP + DB work, and running it
+    # synchronously here blocked FastAPI startup so the API couldn't serve
+    # any request until it finished. The scheduler's daemon thread picks it
+    # up while the app starts taking traffic.
+    _scheduler.add_job(
+        run_recall_refresh,
+        trigger="date",
+        run_date=datetime.now() + timedelta(seconds=5),
+        id="recall_refresh_initial",
+        replace_existing=True,
+    )
 
 
 # ── Manual trigger endpoint ────────────────────────────────────────────────────
@@ -739,6 +820,4 @@ async def manual_refresh_recalls():
     import asyncio
     # run_recall_refresh is synchronous (psycopg2 + requests); run in thread
     summary = await asyncio.to_thread(run_recall_refresh)
-    return summary
-
-run_recall_refresh()
\ No newline at end of file
+    return summary
\ No newline at end of file
@@ -21,7 +21,11 @@ from __future__ import annotations
 
 import asyncio
 import io
+import logging
 import re
+import string
+import sys
+import time
 from typing import Optional
 
 import boto3
@@ -35,8 +39,31 @@ register_heif_opener()
 from database import execute_query
 from fuzzy_recall_matcher import RecallCandidate, get_matcher
 
+log = logging.getLogger(__name__)
+
 router = APIRouter()
 
+# Hard cap on upload size — matches Textract's 10 MB inline-bytes limit.
+_MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+
+def _looks_like_image(head: bytes) -> bool:
+    """
+    Cheap magic-byte sniff over the start of an upload — enough to reject
+    obvious non-images (PDFs, zips, random binaries) after the first chunk,
+    before the rest of the body is buffered or any decode work happens.
+    Covers the formats Pillow + pillow-heif can open here.
+    """
+    return (
+        head.startswith(b"\xff\xd8\xff")            # JPEG
+        or head.startswith(b"\x89PNG\r\n\x1a\n")    # PNG
+        or head.startswith(b"GIF8")                 # GIF
+        or head.startswith(b"BM")                   # BMP
+        or head[:4] in (b"II*\x00", b"MM\x00*")     # TIFF
+        or (head[:4] == b"RIFF" and head[8:12] == b"WEBP")
+        or head[4:8] == b"ftyp"                     # HEIC/HEIF/AVIF container
+    )
+
 NON_ITEM_KEYWORDS = {
     "subtotal", "total", "tax", "cash", "visa", "mastercard", "change",
     "payment", "approved", "debit", "credit", "balance", "receipt",
@@ -47,17 +74,40 @@ NON_ITEM_KEYWORDS = {
 
 # ── Textract helpers ───────────────────────────────────────────────────────────
 
+# Lazily-created shared Textract client — boto3 client construction parses the
+# full service model JSON (tens of ms), which every scan previously repaid.
+# Lazy so importing this module needs no AWS config (mirrors LLM_services).
+_textract_client = None
+
+
+def _get_textract_client():
+    global _textract_client
+    if _textract_client is None:
+        _textract_client = boto3.client("textract", region_name="us-east-1")
+    return _textract_client
+
+
 def _parse_textract_expense(response: dict) -> list[str]:
-    """Extract product line-item names from Textract AnalyzeExpense response."""
+    """
+    Extract product line-item names from Textract AnalyzeExpense response.
+
+    `or ()` defaults (a cheap singleton) instead of `.get(k, [])` and a bound
+    append keep this free of per-iteration allocations — a 40-item receipt
+    walks ~1000 nested dict fields here.
+    """
     items: list[str] = []
-    for doc in response.get("ExpenseDocuments", []):
-        for group in doc.get("LineItemGroups", []):
-            for line in group.get("LineItems", []):
-                for field in line.get("LineItemExpenseFields", []):
-                    if field.get("Type", {}).get("Text") == "ITEM":
-                        text = (field.get("ValueDetection") or {}).get("Text", "").strip()
-                        if text:
-                            items.append(text)
+    append = items.append
+    for doc in response.get("ExpenseDocuments") or ():
+        for group in doc.get("LineItemGroups") or ():
+            for line in group.get("LineItems") or ():
+                for field in line.get("LineItemExpenseFields") or ():
+                    t = field.get("Type")
+                    if t and t.get("Text") == "ITEM":
+                        vd = field.get("ValueDetection")
+                        if vd:
+                            text = vd.get("Text", "").strip()
+                            if text:
+                                append(text)
     return items
 
 
@@ -84,6 +134,21 @@ def _parse_textract_text_fallback(response: dict) -> list[str]:
 
 # ── Cleaning / filtering helpers ──────────────────────────────────────────────
 
+# SKU/code token check used per word in clean_receipt_item. A plain set-lookup
+# loop beats running the regex engine once per word on these short tokens.
+_SKU_ALPHABET = frozenset(string.ascii_uppercase + string.digits)
+_DIGITS = frozenset(string.digits)
+
+
+def _is_sku_token(w: str) -> bool:
+    """Code-like token: 2-8 chars, all uppercase alphanumerics, ≥1 digit."""
+    return (
+        2 <= len(w) <= 8
+        and all(c in _SKU_ALPHABET for c in w)
+        and any(c in _DIGITS for c in w)
+    )
+
+
 def _tokenize(text: str) -> list[str]:
     return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if len(t) > 2]
 
@@ -95,41 +160,46 @@ def _is_non_item_line(text: str) -> bool:
     return bool(tokens & NON_ITEM_KEYWORDS)
 
 
+# Patterns for clean_receipt_item, compiled once at import. Prices, quantity
+# prefixes, and bare leading counts don't interact, so they fuse into one
+# alternation (one pass instead of three). The trailing-unit pattern stays a
+# separate pass: its $ anchor must run AFTER prices are stripped ("BREAD 16
+# OZ 2.49" only loses "16 OZ" once "2.49" is gone).
+_STRIP_RE = re.compile(
+    r"\$?\d+\.\d{2}"        # prices: $3.99 or 3.99
+    r"|^\d+\s*[xX@]\s*"     # leading quantity prefix: "2 @ ", "3x ", "1 X "
+    r"|^\d+\s+"             # bare leading count
+)
+_TRAILING_UNIT_RE = re.compile(
+    r"\s+\d+(\.\d+)?\s*(LB|OZ|EA|CT|PK|LT|ML|G|KG)?\s*$",
+    re.IGNORECASE,
+)
+_SLASH_CODE_RE = re.compile(r"\b[A-Z]/[A-Z]\b")          # short slash codes like F/L
+_DESCRIPTOR_RE = re.compile(r"\b(LOOSE|TUB|BAG)\b", re.IGNORECASE)
+_WS_RE = re.compile(r"\s+")
+
+
 def clean_receipt_item(raw: str) -> str:
     """
     Clean a raw receipt line item into recall-matching-friendly text.
     """
-    text = raw.strip()
+    # Prices + quantity prefixes + leading counts in one pass
+    text = _STRIP_RE.sub("", raw.strip())
 
-    # Remove prices: $3.99 or 3.99
-    text = re.sub(r"\$?\d+\.\d{2}", "", text)
+    # Trailing size/weight/count units like "125ML", "16 OZ", "2 KG"
+    text = _TRAILING_UNIT_RE.sub("", text)
 
-    # Remove leading quantity prefix: "2 @ ", "3x ", "1 X "
-    text = re.sub(r"^\d+\s*[xX@]\s*", "", text)
-    text = re.sub(r"^\d+\s+", "", text)
-
-    # Remove trailing size/weight/count units like "125ML", "16 OZ", "2 KG"
-    text = re.sub(
-        r"\s+\d+(\.\d+)?\s*(LB|OZ|EA|CT|PK|LT|ML|G|KG)?\s*$",
-        "",
-        text,
-        flags=re.IGNORECASE,
-    )
-
-    # Remove short slash codes like F/L
-    text = re.sub(r"\b[A-Z]/[A-Z]\b", " ", text)
+    # Short slash codes like F/L
+    text = _SLASH_CODE_RE.sub(" ", text)
 
     # Drop only code-like tokens that contain digits
-    words = [
-        w for w in text.split()
-        if not re.match(r"^(?=.*\d)[A-Z0-9]{2,8}$", w)
-    ]
+    words = [w for w in text.split() if not _is_sku_token(w)]
 
-    cleaned = " ".join(words).strip()
+    cleaned = " ".join(words)
 
     # Remove a few retail descriptors that usually hurt matching
-    cleaned = re.sub(r"\b(LOOSE|TUB|BAG)\b", "", cleaned, flags=re.IGNORECASE)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _DESCRIPTOR_RE.sub("", cleaned)
+    cleaned = _WS_RE.sub(" ", cleaned).strip()
 
     return cleaned
 
@@ -153,30 +223,48 @@ def _save_receipt_items_to_cart(uid: int, items: list[dict], store_name: Optiona
     Each item dict must have 'cleaned' (the display name).
     Uses the partial unique index (user_id, product_name) WHERE product_upc IS NULL
     for conflict detection, so duplicate receipt items are silently skipped.
+    All items go in a single multi-row INSERT (one DB round trip).
 
     Returns the number of rows actually inserted.
     """
-    inserted = 0
+    if not items:
+        return 0
+
+    # Deduplicate by cleaned name within the batch — receipts routinely
+    # repeat line items ("MILK" twice), and a multi-row INSERT cannot hit
+    # the same ON CONFLICT key twice within one statement.
+    seen: set[str] = set()
+    names: list[str] = []
     for item in items:
         name = item["cleaned"][:255]  # match column width
-        try:
-            result = execute_query(
-                """
-                INSERT INTO user_carts
-                    (user_id, product_upc, product_name, brand_name, source, store_name)
-                VALUES
-                    (%s, NULL, %s, '', 'receipt', %s)
-                ON CONFLICT (user_id, product_name) WHERE product_upc IS NULL
-                DO NOTHING
-                RETURNING id;
-                """,
-                (uid, name, store_name),
-            )
-            if result:
-                inserted += 1
-        except Exception as e:
-            log.warning("Failed to save receipt item '%s' for user %s: %s", name, uid, e)
-    return inserted
+        if name not in seen:
+            seen.add(name)
+            names.append(name)
+
+    # One multi-row INSERT instead of one round trip per line item —
+    # a 20-item receipt previously paid 20 connection+query round trips.
+    values_sql = ", ".join(["(%s, NULL, %s, '', 'receipt', %s)"] * len(names))
+    params: list = []
+    for name in names:
+        params.extend((uid, name, store_name))
+
+    try:
+        result = execute_query(
+            f"""
+            INSERT INTO user_carts
+                (user_id, product_upc, product_name, brand_name, source, store_name)
+            VALUES
+                {values_sql}
+            ON CONFLICT (user_id, product_name) WHERE product_upc IS NULL
+            DO NOTHING
+            RETURNING id;
+            """,
+            tuple(params),
+        )
+        return len(result)
+    except Exception as e:
+        log.warning("Failed to save %d receipt items for user %s: %s", len(items), uid, e)
+        return 0
 
 
 # ── Recall candidate loading ──────────────────────────────────────────────────
@@ -204,21 +292,82 @@ def _load_recall_candidates() -> list[RecallCandidate]:
 
     candidates: list[RecallCandidate] = []
     for r in rows:
+        # Intern the small-cardinality columns — candidates now live for the
+        # matcher cache's lifetime, and interning makes repeated brand /
+        # severity / source strings share one heap allocation.
         candidates.append(
             RecallCandidate(
                 id=int(r["id"]),
                 upc=str(r.get("upc") or ""),
                 product_name=r.get("product_name") or "",
-                brand_name=r.get("brand_name") or "",
+                brand_name=sys.intern(r.get("brand_name") or ""),
                 recall_date=str(r.get("recall_date") or ""),
                 reason=r.get("reason") or "",
-                severity=r.get("severity") or "",
-                source=r.get("source") or "FDA",
+                severity=sys.intern(r.get("severity") or ""),
+                source=sys.intern(r.get("source") or "FDA"),
             )
         )
     return candidates
 
 
+# Cached (candidates, fitted matcher) snapshot. Re-querying every recall row
+# and re-fitting the TF-IDF vectorizer on each scan made matcher setup the
+# dominant per-request cost; recalls only change when the FDA refresh runs,
+# so a short TTL is safe.
+_MATCHER_TTL_SECONDS = 300
+_matcher_cache: dict = {"expires": 0.0, "name": None, "matcher": None}
+
+
+def _get_recall_matcher(matcher_name: str):
+    """Return a fitted matcher over current recalls, rebuilt at most every TTL."""
+    now = time.time()
+    if _matcher_cache["matcher"] is not None \
+            and _matcher_cache["name"] == matcher_name \
+            and now < _matcher_cache["expires"]:
+        return _matcher_cache["matcher"]
+
+    candidates = _load_recall_candidates()
+    matcher = get_matcher(matcher_name, candidates)
+    _matcher_cache.update(
+        expires=now + _MATCHER_TTL_SECONDS,
+        name=matcher_name,
+        matcher=matcher,
+    )
+    return matcher
+
+
+def invalidate_matcher_cache() -> None:
+    """Force the next scan to reload recalls. Called after a recall refresh."""
+    _matcher_cache["expires"] = 0.0
+
+
+# ── Image normalization ───────────────────────────────────────────────────────
+
+def _normalize_image(image_bytes: bytes) -> bytes:
+    """
+    Decode, orient, downscale, and re-encode an upload as Textract-friendly
+    JPEG. Pure CPU work (libjpeg/libheif) — callers run it on a worker
+    thread so the event loop keeps serving other requests meanwhile.
+    """
+    img = Image.open(io.BytesIO(image_bytes))
+    img = ImageOps.exif_transpose(img)  # auto-rotate based on EXIF orientation
+    img = img.convert("RGB")  # strip alpha / CMYK / palette modes
+
+    # Resize if either dimension exceeds 1600 px (preserve aspect ratio)
+    max_side = 1600
+    if max(img.width, img.height) > max_side:
+        img.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    # Re-encode as JPEG, reducing quality until under 4 MB
+    for quality in (85, 70, 55):
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=quality, optimize=True)
+        image_bytes = buf.getvalue()
+        if len(image_bytes) < 4 * 1024 * 1024:
+            break
+    return image_bytes
+
+
 # ── Endpoint ──────────────────────────────────────────────────────────────────
 
 @router.post("/api/receipt/scan")
@@ -263,43 +412,74 @@ async def scan_receipt(
     """
     uid = _parse_user_id(user_id)
 
-    image_bytes = await file.read()
+    # Read the upload in 1 MB chunks with a hard size cap instead of slurping
+    # the whole body into memory — bounds peak RSS under concurrent uploads
+    # and rejects oversized bodies before any decode work happens.
+    buf = bytearray()
+    while chunk := await file.read(1 << 20):
+        if not buf and not _looks_like_image(chunk):
+            raise HTTPException(
+                status_code=415,
+                detail="Upload does not look like an image (JPEG, PNG, HEIC, WebP, TIFF, BMP, GIF).",
+            )
+        buf.extend(chunk)
+        if len(buf) > _MAX_UPLOAD_BYTES:
+            raise HTTPException(status_code=413, detail="Image too large (max 10 MB).")
+    image_bytes = bytes(buf)
+    del buf  # release the staging buffer — image_bytes is the single copy now
     if not image_bytes:
         raise HTTPException(status_code=400, detail="Empty file uploaded.")
 
     # Step 1: Normalize image — resize + compress so Textract always accepts it.
     # Textract inline-bytes limit: 10 MB. High-res phone photos often exceed this.
-    # We cap the longest side at 2000 px and re-encode as JPEG ≤ 4 MB.
-    try:
-        img = Image.open(io.BytesIO(image_bytes))
-        img = ImageOps.exif_transpose(img)  # auto-rotate based on EXIF orientation
-        img = img.convert("RGB")  # strip alpha / CMYK / palette modes
-
-        # Resize if either dimension exceeds 2000 px (preserve aspect ratio)
-        max_side = 2000
-        if max(img.width, img.height) > max_side:
-            img.thumbnail((max_side, max_side), Image.LANCZOS)
-
-        # Re-encode as JPEG, reducing quality until under 4 MB
-        for quality in (85, 70, 55):
-            buf = io.BytesIO()
-            img.save(buf, format="JPEG", quality=quality, optimize=True)
-            image_bytes = buf.getvalue()
-            if len(image_bytes) < 4 * 1024 * 1024:
-                break
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Could not read image: {exc}")
+    # We cap the longest side at 1600 px and re-encode as JPEG ≤ 4 MB —
+    # Textract's OCR accuracy plateaus around 1500 px on the long edge, so
+    # anything larger just inflates the upload and Textract processing time.
+    #
+    # Fast path: if the bytes are already JPEG/PNG and the payload is small,
+    # skip the Pillow decode+re-encode entirely — decoding an 8 MP JPEG costs
+    # tens of ms per request and Textract handles orientation itself. Only
+    # HEIC/WebP/unknown or oversized uploads pay for full normalization.
+    # Sniff the magic bytes rather than trusting Content-Type — mobile
+    # clients routinely upload real JPEGs as application/octet-stream.
+    is_jpeg = image_bytes[:3] == b"\xff\xd8\xff"
+    is_png  = image_bytes[:8] == b"\x89PNG\r\n\x1a\n"
+    needs_normalize = not ((is_jpeg or is_png) and len(image_bytes) < 5_000_000)
+    if needs_normalize:
+        try:
+            # Run the decode+re-encode on a worker thread — blocking the
+            # event loop for hundreds of ms of libjpeg work would serialize
+            # every concurrent scan behind it.
+            image_bytes = await asyncio.to_thread(_normalize_image, image_bytes)
+        except Exception as exc:
+            raise HTTPException(status_code=400, detail=f"Could not read image: {exc}")
 
     # Step 2: Textract OCR
+    # Fire AnalyzeExpense and DetectDocumentText concurrently instead of
+    # serially falling back — the text fallback is only consumed when the
+    # expense call yields no line items, but issuing both upfront halves
+    # wall-clock latency on exactly those hard receipts (at the cost of one
+    # extra Textract call per scan).
     store_name: Optional[str] = None
     try:
-        textract = boto3.client("textract", region_name="us-east-1")
-        expense_response = textract.analyze_expense(Document={"Bytes": image_bytes})
+        textract = _get_textract_client()
+        expense_response, text_response = await asyncio.gather(
+            asyncio.to_thread(textract.analyze_expense, Document={"Bytes": image_bytes}),
+            asyncio.to_thread(textract.detect_document_text, Document={"Bytes": image_bytes}),
+            return_exceptions=True,
+        )
+        # The expense call is the primary source — its failure is fatal.
+        # A failed text call (throttling is likelier now that both calls
+        # always fire) only matters when the expense parse came back empty
+        # and the fallback is actually needed.
+        if isinstance(expense_response, BaseException):
+            raise expense_response
         raw_items = _parse_textract_expense(expense_response)
         store_name = _parse_vendor_name(expense_response)
 
         if not raw_items:
-            text_response = textract.detect_document_text(Document={"Bytes": image_bytes})
+            if isinstance(text_response, BaseException):
+                raise text_response
             raw_items = _parse_textract_text_fallback(text_response)
 
     except Exception as exc:
@@ -339,52 +519,59 @@ async def scan_receipt(
         except Exception as e:
             log.warning("Cart save failed for user %s: %s", uid, e)
 
-    # Step 5: Load recall candidates and initialize matcher
-    try:
-        recall_candidates = _load_recall_candidates()
-    except Exception as exc:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Could not load recall candidates: {exc}",
-        )
-
+    # Step 5: Get the (cached) recall matcher
     matcher_name = "tfidf_hybrid"
     matcher_threshold = 0.60
 
     try:
-        matcher = get_matcher(matcher_name, recall_candidates)
-    except Exception as exc:
+        matcher = _get_recall_matcher(matcher_name)
+    except ValueError as exc:
         raise HTTPException(
             status_code=500,
             detail=f"Invalid recall matcher configuration: {exc}",
         )
+    except Exception as exc:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Could not load recall candidates: {exc}",
+        )
 
     # Step 6: Run recall matching concurrently
+    # Receipts repeat line items ("MILK" twice, multi-buy deals) — match
+    # each unique cleaned string once and fan the result back to every
+    # entry that produced it.
+    unique: dict[str, list[dict]] = {}
+    for e in cleaned_items:
+        unique.setdefault(e["cleaned"], []).append(e)
+
     semaphore = asyncio.Semaphore(6)
 
-    async def lookup(entry: dict):
+    async def lookup(cleaned: str):
         async with semaphore:
             match = await asyncio.to_thread(
                 matcher.best_match,
-                entry["cleaned"],
+                cleaned,
                 matcher_threshold,
             )
-            return entry, match
+            return cleaned, match
 
     results = await asyncio.gather(
-        *[lookup(e) for e in cleaned_items],
+        *[lookup(q) for q in unique],
         return_exceptions=True,
     )
 
-    matched_recalls: list[dict] = []
-    safe_items: list[dict] = []
-
+    matched_results: list[tuple[dict, object]] = []
     for result in results:
         if isinstance(result, Exception):
             continue
+        cleaned, match = result
+        for entry in unique[cleaned]:
+            matched_results.append((entry, match))
 
-        entry, match = result
+    matched_recalls: list[dict] = []
+    safe_items: list[dict] = []
 
+    for entry, match in matched_results:
         if match is None:
             safe_items.append({
                 "raw_text":    entry["raw"],
@@ -78,14 +78,16 @@ Conservative rules:
  
 from __future__ import annotations
  
+import asyncio
 import logging
+import time
 from typing import Optional
  
 from fastapi import APIRouter, HTTPException, Query
  
 from database import execute_query
 from ingredient_risk_engine import analyse_product_risk
-from barcode_routes import _lookup_off, _cache_product, check_recall
+from barcode_routes import _lookup_off, _cache_product, _split_ingredients, check_recall
  
 log = logging.getLogger(__name__)
  
@@ -122,22 +124,43 @@ def _load_user_profile(user_id: int) -> dict:
     return {"allergens": allergens, "diets": diets, "state": row.get("state")}
  
  
+# In-process memo for product lookups — product rows are effectively
+# immutable once cached in the DB, so repeat scans of the same (viral) UPC
+# skip even the DB round trip. Misses get a shorter TTL so a manual submit
+# shows up quickly.
+_PRODUCT_CACHE_TTL     = 300
+_PRODUCT_NEG_CACHE_TTL = 60
+_product_cache: dict[str, tuple[float, Optional[dict]]] = {}
+
+
 def _resolve_product(upc: str) -> Optional[dict]:
     """
     Look up a product by UPC.
- 
-    Checks the local DB cache first; falls back to Open Food Facts API.
-    Caches the OFFs result for future lookups.
+
+    Checks the in-process memo, then the local DB cache, then the Open Food
+    Facts API. Caches the OFF result for future lookups.
     Returns a product dict or None if not found.
     """
+    now = time.time()
+    cached = _product_cache.get(upc)
+    if cached and now < cached[0]:
+        return cached[1]
+
+    product: Optional[dict] = None
     rows = execute_query("SELECT * FROM products WHERE upc = %s LIMIT 1;", (upc,))
     if rows:
-        return rows[0]
-    off_data = _lookup_off(upc)
-    if off_data:
-        _cache_product(off_data)
-        return off_data
-    return None
+        product = rows[0]
+    else:
+        off_data = _lookup_off(upc)
+        if off_data:
+            _cache_product(off_data)
+            product = off_data
+
+    if len(_product_cache) > 4096:   # keep the memo bounded
+        _product_cache.clear()
+    ttl = _PRODUCT_CACHE_TTL if product is not None else _PRODUCT_NEG_CACHE_TTL
+    _product_cache[upc] = (now + ttl, product)
+    return product
  
  
 def _load_recall_summary(recall_id: Optional[int]) -> Optional[dict]:
@@ -301,7 +324,10 @@ async def scan_barcode_with_risk(
     immediately after the camera decodes a barcode.
     """
     # ── 1. Product lookup ────────────────────────────────────────────────────
-    product = _resolve_product(upc)
+    # The sync helpers below do blocking I/O (psycopg2, Open Food Facts);
+    # run them on the thread pool so the event loop keeps serving other
+    # scans while this one waits on the network.
+    product = await asyncio.to_thread(_resolve_product, upc)
     if not product:
         return {
             "found":         False,
@@ -318,16 +344,17 @@ async def scan_barcode_with_risk(
     diets:      list[str]     = []
     user_state: Optional[str] = None
     if user_id:
-        profile    = _load_user_profile(user_id)
+        profile    = await asyncio.to_thread(_load_user_profile, user_id)
         allergens  = profile["allergens"]
         diets      = profile["diets"]
         user_state = profile["state"]
- 
+
     # ── 3. Recall check ───────────────────────────────────────────────────────
-    recall_info = check_recall(
+    recall_info = await asyncio.to_thread(
+        check_recall,
         upc,
-        product_name=product.get("product_name") or "",
-        brand_name=product.get("brand_name") or "",
+        product.get("product_name") or "",
+        product.get("brand_name") or "",
     )
  
     # ── 4. State-based recall filtering ───────────────────────────────────────
@@ -359,11 +386,7 @@ async def scan_barcode_with_risk(
     ingredients_text = product.get("ingredients") or ""
  
     # Flat ingredient list for the product response (display only)
-    ingredients_list = [
-        i.strip()
-        for i in ingredients_text.replace("|", ",").split(",")
-        if i.strip()
-    ]
+    ingredients_list = _split_ingredients(ingredients_text)
  
     report = analyse_product_risk(
         ingredients_text=ingredients_text,
@@ -28,6 +28,7 @@ API endpoints:
 import logging
 import os
 import re
+import sys
 
 from fastapi import APIRouter, HTTPException
 
@@ -227,16 +228,18 @@ def _generate_fuzzy_alerts() -> int:
         int(r["id"]): r.get("distribution_pattern") for r in rows
     }
  
+    # brand/severity/source repeat heavily across recalls — intern them so
+    # the full candidate list shares one allocation per distinct value.
     candidates = [
         RecallCandidate(
             id=int(r["id"]),
             upc=str(r.get("upc") or ""),
             product_name=r.get("product_name") or "",
-            brand_name=r.get("brand_name") or "",
+            brand_name=sys.intern(r.get("brand_name") or ""),
             recall_date=str(r.get("recall_date") or ""),
             reason=r.get("reason") or "",
-            severity=r.get("severity") or "",
-            source=r.get("source") or "FDA",
+            severity=sys.intern(r.get("severity") or ""),
+            source=sys.intern(r.get("source") or "FDA"),
         )
         for r in rows
     ]
@@ -473,12 +476,13 @@ async def get_user_alerts(user_id: str):
             "product_name": r["product_name"] or r["recall_product_name"],
             "viewed":       r["viewed"],
             "dismissed":    r.get("dismissed") or False,
-            "created_at":   str(r["created_at"]),
+            "created_at":   r["created_at"],   # orjson encodes datetimes natively
+
             "recall": {
                 "recall_id":    r["recall_id"],
                 "product_name": r["recall_product_name"],
                 "brand_name":   r["brand_name"] or "",
-                "recall_date":  str(r["recall_date"]),
+                "recall_date":  r["recall_date"],
                 "reason":       r["reason"],
                 "severity":     r["severity"] or "",
                 "distribution": r["distribution_pattern"] or "",
@@ -12,9 +12,12 @@ Endpoints:
   DELETE /api/user/cart/{user_id}/receipt/{name} – remove a receipt item by name
 """
 
+import asyncio
+import os
+
 import bcrypt
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 
 from database import execute_query
@@ -39,6 +42,10 @@ class UserLogin(BaseModel):
 
 
 class UserCartItem(BaseModel):
+    # Hot path for every cart add — skip unknown-field errors and assignment
+    # validation (instances are never mutated).
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
     user_id:      str
     upc:          Optional[str] = None   # None for receipt-sourced items
     product_name: str
@@ -77,7 +84,13 @@ async def register_user(user: UserRegister):
     if existing:
         raise HTTPException(status_code=409, detail="An account with this email already exists.")
 
-    password_hash = bcrypt.hashpw(user.password.encode(), bcrypt.gensalt()).decode()
+    # bcrypt at the default work factor is ~250 ms of pure CPU — run it on
+    # the thread pool so the event loop keeps serving requests meanwhile.
+    # BCRYPT_ROUNDS stays at 12 in production; dev/test can lower it.
+    rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    password_hash = await asyncio.to_thread(
+        lambda: bcrypt.hashpw(user.password.encode(), bcrypt.gensalt(rounds=rounds)).decode()
+    )
 
     result = execute_query(
         """
@@ -104,7 +117,7 @@ async def register_user(user: UserRegister):
             "state":            new_user.get("state"),
             "allergens":        new_user.get("allergens") or [],
             "diet_preferences": new_user.get("diet_preferences") or [],
-            "created_at":       str(new_user["created_at"]),
+            "created_at":       new_user["created_at"],   # orjson encodes datetimes natively
         },
     }
 
@@ -124,7 +137,13 @@ async def login_user(credentials: UserLogin):
         raise HTTPException(status_code=401, detail="Invalid email or password.")
 
     user = result[0]
-    if not bcrypt.checkpw(credentials.password.encode(), user["password_hash"].encode()):
+    # checkpw costs the same bcrypt work as hashing — keep it off the loop.
+    password_ok = await asyncio.to_thread(
+        bcrypt.checkpw,
+        credentials.password.encode(),
+        user["password_hash"].encode(),
+    )
+    if not password_ok:
         raise HTTPException(status_code=401, detail="Invalid email or password.")
 
     return {
@@ -136,7 +155,7 @@ async def login_user(credentials: UserLogin):
             "state":            user.get("state"),
             "allergens":        user.get("allergens") or [],
             "diet_preferences": user.get("diet_preferences") or [],
-            "created_at":       str(user["created_at"]),
+            "created_at":       user["created_at"],   # orjson encodes datetimes natively
         },
     }
 
@@ -233,18 +252,10 @@ async def get_user_cart(user_id: str):
         """,
         (uid,),
     )
-    cart = [
-        {
-            "upc":          r["upc"],
-            "product_name": r["product_name"],
-            "brand_name":   r["brand_name"],
-            "added_date":   str(r["added_date"]),
-            "source":       r.get("source", "barcode"),
-            "store_name":   r.get("store_name"),
-        }
-        for r in rows
-    ]
-    return {"user_id": user_id, "cart": cart, "count": len(cart)}
+    # Rows already match the response shape (columns aliased in the SELECT),
+    # and orjson encodes the added_date timestamp natively — no per-row
+    # rebuild needed.
+    return {"user_id": user_id, "cart": rows, "count": len(rows)}
 
 
 @router.post("/api/user/cart")
@@ -297,7 +308,7 @@ async def add_to_cart(item: UserCartItem):
             "upc":          row["upc"],
             "product_name": row["product_name"],
             "brand_name":   row["brand_name"],
-            "added_date":   str(row["added_date"]),
+            "added_date":   row["added_date"],   # orjson encodes datetimes natively
             "source":       row["source"],
         },
     }